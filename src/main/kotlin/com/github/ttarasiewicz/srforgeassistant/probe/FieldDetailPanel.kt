@@ -673,6 +673,7 @@ class FieldDetailPanel(private val diffs: List<FieldDiff>, private val project:
         }
         if (snapshot.meanValue != null) addDetailRow(panel, "Mean", snapshot.meanValue, monoFont, color)
         if (snapshot.stdValue != null) addDetailRow(panel, "Std", snapshot.stdValue, monoFont, color)
+        if (snapshot.sampled) addDetailRow(panel, "Stats", "estimated from a strided sample", monoFont, mutedColor)
         if (snapshot.preview != null) addDetailRow(panel, "Value", snapshot.preview, monoFont, mutedColor)
         if (snapshot.sizeBytes != null) addDetailRow(panel, "Size", formatBytes(snapshot.sizeBytes), monoFont, mutedColor)
     }
@@ -82,6 +82,7 @@ object ProbeExecutor {
 
             val handler = OSProcessHandler(cmd)
             val buffer = StringBuilder()
+            val snapshotAssembler = SnapshotAssembler()
             val receivedComplete = java.util.concurrent.atomic.AtomicBoolean(false)
 
             handler.addProcessListener(object : ProcessListener {
@@ -97,7 +98,7 @@ object ProbeExecutor {
 
                         if (line.startsWith(EVENT_MARKER)) {
                             val json = line.substring(EVENT_MARKER.length)
-                            val probeEvent = parseEvent(json)
+                            val probeEvent = parseEvent(json, snapshotAssembler)
                             if (probeEvent != null) {
                                 if (probeEvent is ProbeEvent.Complete) receivedComplete.set(true)
                                 emitOnEdt(onEvent, probeEvent)
@@ -164,9 +165,48 @@ object ProbeExecutor {
 
     // ── Event parsing ─────────────────────────────────────────────────
 
-    private fun parseEvent(json: String): ProbeEvent? {
+    private val gson = com.google.gson.Gson()
+
+    /**
+     * Reassembles the streamed `snapshot_start` → `snapshot_field`* → `snapshot_end`
+     * sequence into a single [ProbeEvent.Snapshot]. The script emits one line
+     * per field so no event grows with the size of the whole Entry.
+     * One instance per probe run; only touched from the process output thread.
+     */
+    private class SnapshotAssembler {
+        private var header: JsonObject? = null
+        private val fields = mutableListOf<FieldSnapshot>()
+
+        fun start(obj: JsonObject) {
+            header = obj
+            fields.clear()
+        }
+
+        fun add(field: FieldSnapshot) {
+            if (header != null) fields.add(field)
+        }
+
+        /** Completes the open snapshot, or returns null if none was started. */
+        fun finish(): ProbeEvent.Snapshot? {
+            val h = header ?: return null
+            header = null
+            return ProbeEvent.Snapshot(EntrySnapshot(
+                stepLabel = h.get("stepLabel")?.asString ?: "",
+                stepIndex = h.get("stepIndex")?.asInt ?: 0,
+                fields = fields.toList(),
+                isBatched = h.get("isBatched")?.asBoolean ?: false,
+            ))
+        }
+
+        /** Drops a partially streamed snapshot (e.g. the step failed mid-way). */
+        fun reset() {
+            header = null
+            fields.clear()
+        }
+    }
+
+    private fun parseEvent(json: String, snapshots: SnapshotAssembler): ProbeEvent? {
         return try {
-            val gson = com.google.gson.Gson()
             val obj = gson.fromJson(json, JsonObject::class.java)
             val type = obj.get("type")?.asString ?: return null
 
@@ -176,22 +216,24 @@ object ProbeExecutor {
                     datasetTarget = obj.get("datasetTarget")?.asString ?: "",
                     datasetPath = obj.get("datasetPath")?.asString ?: ""
                 )
-                "snapshot" -> {
-                    val fields = (obj.getAsJsonArray("fields") ?: com.google.gson.JsonArray())
-                        .map { parseFieldSnapshot(it.asJsonObject) }
-                    ProbeEvent.Snapshot(EntrySnapshot(
+                "snapshot_start" -> {
+                    snapshots.start(obj)
+                    null
+                }
+                "snapshot_field" -> {
+                    obj.getAsJsonObject("field")?.let { snapshots.add(parseFieldSnapshot(it)) }
+                    null
+                }
+                "snapshot_end" -> snapshots.finish()
+                "step_error" -> {
+                    snapshots.reset()
+                    ProbeEvent.StepError(
                         stepLabel = obj.get("stepLabel")?.asString ?: "",
                         stepIndex = obj.get("stepIndex")?.asInt ?: 0,
-                        fields = fields,
-                        isBatched = obj.get("isBatched")?.asBoolean ?: false,
-                    ))
+                        errorMessage = obj.get("errorMessage")?.asString ?: "Unknown error",
+                        errorTraceback = obj.get("errorTraceback")?.takeIf { !it.isJsonNull }?.asString
+                    )
                 }
-                "step_error" -> ProbeEvent.StepError(
-                    stepLabel = obj.get("stepLabel")?.asString ?: "",
-                    stepIndex = obj.get("stepIndex")?.asInt ?: 0,
-                    errorMessage = obj.get("errorMessage")?.asString ?: "Unknown error",
-                    errorTraceback = obj.get("errorTraceback")?.takeIf { !it.isJsonNull }?.asString
-                )
                 "init_error" -> ProbeEvent.InitError(
                     errorMessage = obj.get("errorMessage")?.asString ?: "Unknown error",
                     errorTraceback = obj.get("errorTraceback")?.takeIf { !it.isJsonNull }?.asString
@@ -236,7 +278,8 @@ object ProbeExecutor {
             preview = fo.get("preview")?.takeIf { !it.isJsonNull }?.asString,
             sizeBytes = fo.get("sizeBytes")?.takeIf { !it.isJsonNull }?.asLong,
             children = children,
-            npyPath = fo.get("npyPath")?.takeIf { !it.isJsonNull }?.asString
+            npyPath = fo.get("npyPath")?.takeIf { !it.isJsonNull }?.asString,
+            sampled = fo.get("sampled")?.takeIf { !it.isJsonNull }?.asBoolean ?: false
         )
     }
 }
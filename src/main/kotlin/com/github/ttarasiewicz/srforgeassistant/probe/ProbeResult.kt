@@ -15,7 +15,9 @@ data class FieldSnapshot(
     val preview: String?,
     val sizeBytes: Long?,
     val children: List<FieldSnapshot>? = null,
-    val npyPath: String? = null
+    val npyPath: String? = null,
+    /** True when min/max/mean/std were estimated from a strided sample of a large tensor. */
+    val sampled: Boolean = false
 )
 
 /**
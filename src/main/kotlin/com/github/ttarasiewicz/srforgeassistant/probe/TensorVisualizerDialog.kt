@@ -1,6 +1,7 @@
 package com.github.ttarasiewicz.srforgeassistant.probe
 
 import com.google.gson.Gson
+import com.google.gson.JsonElement
 import com.google.gson.JsonObject
 import com.intellij.openapi.project.Project
 import com.intellij.openapi.ui.ComboBox
@@ -53,6 +54,25 @@ class TensorVisualizerDialog(
      */
     private var vizPending = false
 
+    /**
+     * Recent viz results keyed by render config plus the .npy file's mtime
+     * and size. Flipping back to a colormap / channel / display setting the
+     * user already looked at is served from here instead of relaunching
+     * Python and reloading the tensor. Entries are stored without
+     * `rawPixels`, which live once per pixel-defining config in
+     * [rawPixelCache]. Guarded by itself: filled from the render thread,
+     * cleared on dispose.
+     */
+    private val resultCache = PayloadLruCache<JsonObject>(RESULT_CACHE_MAX_CHARS)
+
+    /**
+     * Base64 `rawPixels` keyed by the .npy file and the config fields that
+     * decide the pixel values (dim roles and channel selection), so the
+     * colormap / display-mode variants of one image share a single copy.
+     * Guarded by [resultCache].
+     */
+    private val rawPixelCache = PayloadLruCache<String>(RAW_PIXEL_CACHE_MAX_CHARS)
+
     // Raw float pixel data for hover inspection (H×W×C float32)
     private var rawPixels: FloatArray? = null
     private var rawPixelH = 0
@@ -439,6 +459,10 @@ class TensorVisualizerDialog(
 
     override fun dispose() {
         super.dispose()
+        synchronized(resultCache) {
+            resultCache.clear()
+            rawPixelCache.clear()
+        }
         if (cleanupNpyOnClose && field.npyPath != null) {
             try {
                 File(field.npyPath).delete()
@@ -622,7 +646,7 @@ class TensorVisualizerDialog(
         val config = buildVizConfig()
 
         Thread {
-            val result = runVizScript(config)
+            val result = renderCached(config)
             SwingUtilities.invokeLater {
                 isLoading = false
                 applyVizResult(result)
@@ -702,12 +726,53 @@ class TensorVisualizerDialog(
             "customMax" to (customMaxField.text.toDoubleOrNull() ?: 1.0),
             "colormap" to (colormapCombo.selectedItem as String),
             "outputWidth" to 1024,
+            "includeRawPixels" to true,  // needed for hover pixel inspection
             "numBins" to (binsSpinner.value as Number).toInt()
         )
     }
 
     // ── Viz Script Execution ───────────────────────────────────
 
+    /**
+     * [runVizScript] behind [resultCache] and [rawPixelCache]; only
+     * successful renders are cached. A hit needs both halves, otherwise
+     * the script runs again.
+     */
+    private fun renderCached(config: Map<String, Any?>): JsonObject {
+        val npy = (config["npyPath"] as? String)?.let(::File)?.takeIf { it.isFile }
+            ?: return runVizScript(config)
+        val gson = Gson()
+        val fileKey = "${npy.lastModified()}:${npy.length()}:${npy.path}"
+        val key = "$fileKey:${gson.toJson(config)}"
+        val rawKey = "$fileKey:${gson.toJson(config.filterKeys { it in RAW_PIXEL_CONFIG_KEYS })}"
+        synchronized(resultCache) {
+            val cached = resultCache[key]
+            val raw = rawPixelCache[rawKey]
+            if (cached != null && raw != null) return withRawPixels(cached, raw)
+        }
+        val result = runVizScript(config)
+        val failed = result.get("error")?.takeIf { !it.isJsonNull } != null
+        val raw = result.get("rawPixels")?.takeIf { !it.isJsonNull }?.asString
+        if (!failed && raw != null) {
+            val slim = withRawPixels(result, null)
+            synchronized(resultCache) {
+                resultCache.put(key, slim, slim.toString().length.toLong())
+                rawPixelCache.put(rawKey, raw, raw.length.toLong())
+            }
+        }
+        return result
+    }
+
+    /** Shallow copy of [result] with `rawPixels` replaced (or dropped when null). */
+    private fun withRawPixels(result: JsonObject, raw: String?): JsonObject {
+        val copy = JsonObject()
+        for ((name, value) in result.entrySet()) {
+            if (name != "rawPixels") copy.add(name, value)
+        }
+        if (raw != null) copy.addProperty("rawPixels", raw)
+        return copy
+    }
+
     private fun runVizScript(config: Map<String, Any?>): JsonObject {
         val sdk = ProbeExecutor.getPythonSdk(project)
             ?: return errorResult("No Python SDK configured")
@@ -770,6 +835,31 @@ class TensorVisualizerDialog(
         }
     }
 
+    /** orjson serializes NaN/Inf as null; read those back as NaN instead of throwing. */
+    private fun JsonElement?.asDoubleOrNaN(): Double =
+        if (this == null || isJsonNull) Double.NaN else asDouble
+
+    /**
+     * Single-channel previews arrive as grayscale PNGs. ImageIO decodes
+     * those into a linear-gray image that Java2D gamma-corrects when drawing
+     * or calling getRGB, which washes them out, so copy the gray levels into
+     * an RGB image verbatim.
+     */
+    private fun grayToRgb(img: BufferedImage): BufferedImage {
+        if (img.type != BufferedImage.TYPE_BYTE_GRAY) return img
+        val out = BufferedImage(img.width, img.height, BufferedImage.TYPE_INT_RGB)
+        val row = IntArray(img.width)
+        for (y in 0 until img.height) {
+            img.raster.getSamples(0, y, img.width, 1, 0, row)
+            for (x in row.indices) {
+                val v = row[x]
+                row[x] = (v shl 16) or (v shl 8) or v
+            }
+            out.setRGB(0, y, img.width, 1, row, 0, img.width)
+        }
+        return out
+    }
+
     // ── Apply Viz Result ───────────────────────────────────────
 
     private fun applyVizResult(result: JsonObject) {
@@ -784,19 +874,21 @@ class TensorVisualizerDialog(
         val imageB64 = result.get("image")?.takeIf { !it.isJsonNull }?.asString
         if (imageB64 != null) {
             val imageBytes = java.util.Base64.getDecoder().decode(imageB64)
-            currentImage = ImageIO.read(ByteArrayInputStream(imageBytes))
+            currentImage = ImageIO.read(ByteArrayInputStream(imageBytes))?.let(::grayToRgb)
             imagePanel.setImage(currentImage)
         }
 
-        // Parse histogram
-        val histArray = result.getAsJsonArray("histogram")
-        if (histArray != null) {
-            currentHistogram = histArray.map { bin ->
-                val obj = bin.asJsonObject
+        // Parse histogram (sent as parallel binStarts/binEnds/counts arrays)
+        val histObj = result.get("histogram")?.takeIf { it.isJsonObject }?.asJsonObject
+        if (histObj != null) {
+            val starts = histObj.getAsJsonArray("binStarts")
+            val ends = histObj.getAsJsonArray("binEnds")
+            val counts = histObj.getAsJsonArray("counts")
+            currentHistogram = (0 until counts.size()).map { i ->
                 HistogramBin(
-                    obj.get("binStart").asDouble,
-                    obj.get("binEnd").asDouble,
-                    obj.get("count").asInt
+                    starts[i].asDoubleOrNaN(),
+                    ends[i].asDoubleOrNaN(),
+                    counts[i].asInt
                 )
             }
             histogramPanel.setData(currentHistogram!!)
@@ -806,10 +898,10 @@ class TensorVisualizerDialog(
         val statsObj = result.getAsJsonObject("stats")
         if (statsObj != null) {
             currentStats = VizStats(
-                min = statsObj.get("min").asDouble,
-                max = statsObj.get("max").asDouble,
-                mean = statsObj.get("mean").asDouble,
-                std = statsObj.get("std").asDouble,
+                min = statsObj.get("min").asDoubleOrNaN(),
+                max = statsObj.get("max").asDoubleOrNaN(),
+                mean = statsObj.get("mean").asDoubleOrNaN(),
+                std = statsObj.get("std").asDoubleOrNaN(),
                 shape = statsObj.getAsJsonArray("shape").map { it.asInt }
             )
             updateStatsPanel(currentStats!!)
@@ -1120,9 +1212,55 @@ class TensorVisualizerDialog(
         }
     }
 
+    // ── Render Cache ─────────────────────────────────────────
+
+    /**
+     * Access-ordered LRU bounded by the total payload size (in chars) of its
+     * values rather than by entry count, so a few full-resolution renders
+     * can't pile up in the IDE heap. A value larger than the whole budget is
+     * not cached. Not thread-safe; callers synchronize.
+     */
+    private class PayloadLruCache<V : Any>(private val maxChars: Long) {
+        private val entries = LinkedHashMap<String, Pair<V, Long>>(16, 0.75f, true)
+        private var totalChars = 0L
+
+        operator fun get(key: String): V? = entries[key]?.first
+
+        fun put(key: String, value: V, chars: Long) {
+            entries.remove(key)?.let { totalChars -= it.second }
+            if (chars > maxChars) return
+            entries[key] = value to chars
+            totalChars += chars
+            val eldest = entries.values.iterator()
+            while (totalChars > maxChars) {
+                totalChars -= eldest.next().second
+                eldest.remove()
+            }
+        }
+
+        fun clear() {
+            entries.clear()
+            totalChars = 0L
+        }
+    }
+
     // ── Shape Parsing Helper ─────────────────────────────────
 
     companion object {
+        /** PNG previews plus stats and histogram: a handful of 1024-wide renders. */
+        private const val RESULT_CACHE_MAX_CHARS = 16L * 1024 * 1024
+
+        /**
+         * Raw pixels are full resolution and stay in the heap per open dialog,
+         * so only small and mid-sized tensors are kept: ~48 M base64 chars holds
+         * two 2048×2048 float32 channels, while a 4096² image isn't cached at all.
+         */
+        private const val RAW_PIXEL_CACHE_MAX_CHARS = 48L * 1024 * 1024
+
+        /** Config fields that determine the `rawPixels` payload. */
+        private val RAW_PIXEL_CONFIG_KEYS =
+            setOf("dimRoles", "channelMode", "channelAction", "customRgbChannels")
+
         fun parseShape(shapeStr: String?): List<Int> {
             if (shapeStr == null) return emptyList()
             val cleaned = shapeStr.trim()
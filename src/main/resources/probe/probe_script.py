@@ -13,47 +13,175 @@ import sys
 import os
 import re
 import json
+import math
+import pickle
+import hashlib
+import tempfile
 import traceback
 import time
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ── Event emission ─────────────────────────────────────────────────
 
 _EVENT_MARKER = '===PROBE_EVENT==='
+_EVENT_MARKER_BYTES = _EVENT_MARKER.encode('ascii')
+
+# Events go straight to the binary layer of stdout: one write + one flush
+# per event instead of print()'s str formatting and re-encoding.
+_stdout = sys.stdout
+_stdout_buffer = sys.stdout.buffer
+
+
+def _dumps(event):
+    """Serialize an event to one line of UTF-8 JSON, via orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(event, default=str,
+                                option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # e.g. non-str dict keys or >64-bit ints — stdlib handles those
+    return json.dumps(event, default=str).encode('utf-8')
 
 
 def _emit(event):
     """Emit a single event as a one-line JSON string, flushed immediately."""
-    print(f'{_EVENT_MARKER}{json.dumps(event, default=str)}', flush=True)
+    # Push out anything user code print()ed first so lines don't interleave.
+    _stdout.flush()
+    _stdout_buffer.write(_EVENT_MARKER_BYTES + _dumps(event) + b'\n')
+    _stdout_buffer.flush()
 
 
 # ── Config loading ──────────────────────────────────────────────────
 
+# Bare %{...} reference right after a "key:" separator (space or tab).
+_BARE_REF_RE = re.compile(r'(?<=:[ \t])(%\{[^}]+\})')
+
+
+# Parsed configs are pickled here, keyed by path + mtime + size, so repeat
+# probes of an unchanged YAML skip the PyYAML parse. The directory is
+# per-user (pickles are only loaded from a directory we own).
+_CONFIG_CACHE_DIR = os.path.join(
+    tempfile.gettempdir(),
+    f'srforge_probe_cache_{os.getuid()}' if hasattr(os, 'getuid') else 'srforge_probe_cache',
+)
+# Bump whenever the text rewriting in _load_config changes what gets parsed.
+_CONFIG_CACHE_VERSION = 1
+
+
+def _config_cache_file(abs_path):
+    """Return the cache file for a config path, or None if caching is unavailable."""
+    try:
+        os.makedirs(_CONFIG_CACHE_DIR, mode=0o700, exist_ok=True)
+        if hasattr(os, 'getuid') and os.stat(_CONFIG_CACHE_DIR).st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    digest = hashlib.blake2b(abs_path.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(_CONFIG_CACHE_DIR, f'{digest}.pkl')
+
+
 def _load_config(yaml_path):
     """Load a YAML config, handling SR-Forge's %{...} reference syntax."""
     from omegaconf import OmegaConf
 
-    with open(yaml_path, 'r', encoding='utf-8') as f:
+    abs_path = os.path.abspath(yaml_path)
+    st = os.stat(abs_path)
+    cache_key = (_CONFIG_CACHE_VERSION, abs_path, st.st_mtime_ns, st.st_size)
+    cache_file = _config_cache_file(abs_path)
+
+    if cache_file is not None:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_key, data = pickle.load(f)
+            if cached_key == cache_key:
+                return OmegaConf.create(data)
+        except Exception:
+            pass  # missing, stale or unreadable — fall through to a fresh parse
+
+    with open(abs_path, 'r', encoding='utf-8') as f:
         raw = f.read()
 
     # Quote bare %{...} references that aren't already quoted,
     # so PyYAML doesn't choke on the '%' character.
-    raw = re.sub(r'(?<=: )(%\{[^}]+\})', r'"\1"', raw)
-    raw = re.sub(r'(?<=:\t)(%\{[^}]+\})', r'"\1"', raw)
+    raw = _BARE_REF_RE.sub(r'"\1"', raw)
+
+    data = yaml.load(raw, Loader=_YamlLoader)
+
+    if cache_file is not None:
+        # Write-then-rename so a concurrent probe never reads a torn pickle.
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=_CONFIG_CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((cache_key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            pass
 
-    data = yaml.safe_load(raw)
     cfg = OmegaConf.create(data)
     return cfg
 
 
 # ── Snapshot helpers ────────────────────────────────────────────────
 
-def _snapshot_value(v, key, depth=2, tensor_dir=None, path_prefix=""):
-    """Snapshot a single value with optional children for containers."""
-    import torch
-    import numpy as np
+# Above this many elements, preview stats are computed on a strided sample
+# instead of the whole tensor (and the field is flagged 'sampled').
+_SAMPLE_CAP = 1_000_000
+
+# Container children are emitted until either cap is hit, after which a
+# single "... N more" marker stands in for the rest. The byte budget is
+# shared across one snapshot so deeply nested Entries can't blow up the
+# JSON payload (and the tool window) regardless of their shape.
+_MAX_CHILDREN = 200
+_CHILD_BUDGET_BYTES = 256 * 1024
+# Key names, stat strings and punctuation of one serialized field dict.
+_FIELD_JSON_OVERHEAD = 256
+
+# Characters replaced with '_' when a field key becomes part of a .npy name.
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\-.]')
+
+# torch / numpy, imported on first snapshot rather than at script start so
+# config errors surface without paying the torch import.
+_torch = None
+_np = None
+
+
+def _lazy_imports():
+    """Return (torch, numpy), importing them once on first use."""
+    global _torch, _np
+    if _torch is None:
+        import torch
+        import numpy
+        _torch, _np = torch, numpy
+        _SNAP_DISPATCH[torch.Tensor] = _snap_tensor
+        _SNAP_DISPATCH[numpy.ndarray] = _snap_ndarray
+    return _torch, _np
+
+
+def _snapshot_value(v, key, depth=2, tensor_dir=None, path_prefix="", budget=None):
+    """Snapshot a single value with optional children for containers.
+
+    ``budget`` is a one-element list holding the remaining estimated JSON
+    bytes for container children, shared by the whole recursion.
+    """
+    _lazy_imports()
+    if budget is None:
+        budget = [_CHILD_BUDGET_BYTES]
 
     info = {
         'key': key,
@@ -64,156 +192,340 @@ def _snapshot_value(v, key, depth=2, tensor_dir=None, path_prefix=""):
         'preview': None, 'sizeBytes': None,
         'children': None,
         'npyPath': None,
+        'sampled': False,
     }
 
-    safe_key = re.sub(r'[^\w\-.]', '_', key)
+    handler = _SNAP_DISPATCH.get(type(v))
+    if handler is None:
+        handler = _SNAP_DISPATCH[type(v)] = _resolve_snap_handler(v)
+    handler(v, info, key, depth, tensor_dir, path_prefix, budget)
+    return info
+
 
-    if isinstance(v, torch.Tensor):
-        info['shape'] = str(list(v.shape))
-        info['dtype'] = str(v.dtype).replace('torch.', '')
-        info['sizeBytes'] = v.element_size() * v.nelement()
+def _resolve_snap_handler(v):
+    """Pick a handler for a type missing from _SNAP_DISPATCH (subclasses etc.)."""
+    if isinstance(v, _torch.Tensor):
+        return _snap_tensor
+    if isinstance(v, _np.ndarray):
+        return _snap_ndarray
+    if isinstance(v, dict):
+        return _snap_dict
+    if isinstance(v, (list, tuple)):
+        return _snap_sequence
+    if isinstance(v, (str, int, float, bool)):
+        return _snap_scalar
+    return _snap_other
+
+
+def _snap_tensor(v, info, key, depth, tensor_dir, path_prefix, budget):
+    """Tensor: shape/dtype, preview stats, first values, optional .npy dump."""
+    torch, np = _torch, _np
+    info['shape'] = str(list(v.shape))
+    info['dtype'] = str(v.dtype).replace('torch.', '')
+    info['sizeBytes'] = v.element_size() * v.nelement()
+    try:
+        if v.numel() > 0:
+            # Stack the four reductions so a CUDA tensor pays a single
+            # device->host sync instead of one per .item().
+            fv = v.detach()
+            if fv.numel() > _SAMPLE_CAP:
+                step = -(-fv.numel() // _SAMPLE_CAP)
+                # take() gathers in logical order straight from the strided
+                # storage; flatten() would copy a non-contiguous tensor whole.
+                idx = torch.arange(0, fv.numel(), step, device=fv.device)
+                fv = torch.take(fv, idx)
+                info['sampled'] = True
+            # Only upcast non-float32/64 dtypes (ints, bools, halves) —
+            # float64 stays as is rather than being copied down to float32.
+            if fv.dtype not in (torch.float32, torch.float64):
+                fv = fv.float()
+            mn, mx = torch.aminmax(fv)  # one pass for both extremes
+            stats = torch.stack([mn, mx, fv.mean(), fv.std()]).cpu().tolist()
+            (info['minValue'], info['maxValue'],
+             info['meanValue'], info['stdValue']) = (f'{s:.6g}' for s in stats)
+    except Exception:
+        pass
+    try:
+        # Slice on the device so only the previewed values cross to the host.
+        flat = v.detach().flatten()[:8].cpu()
+        info['preview'] = str(flat.tolist())
+    except Exception:
+        info['preview'] = f'Tensor{list(v.shape)}'
+    if tensor_dir is not None:
         try:
-            if v.numel() > 0:
-                fv = v.float()
-                info['minValue'] = f'{fv.min().item():.6g}'
-                info['maxValue'] = f'{fv.max().item():.6g}'
-                info['meanValue'] = f'{fv.mean().item():.6g}'
-                info['stdValue'] = f'{fv.std().item():.6g}'
+            safe_key = _UNSAFE_FILENAME_RE.sub('_', key)
+            npy_path = os.path.join(tensor_dir, f'{path_prefix}{safe_key}.npy')
+            np.save(npy_path, v.detach().cpu().numpy())
+            info['npyPath'] = npy_path
         except Exception:
             pass
+
+
+def _snap_ndarray(v, info, key, depth, tensor_dir, path_prefix, budget):
+    """ndarray: same fields as _snap_tensor."""
+    np = _np
+    info['shape'] = str(list(v.shape))
+    info['dtype'] = str(v.dtype)
+    info['sizeBytes'] = int(v.nbytes)
+    try:
+        if v.size > 0:
+            fv = v
+            if fv.size > _SAMPLE_CAP:
+                step = -(-fv.size // _SAMPLE_CAP)
+                fv = fv.flat[::step]
+                info['sampled'] = True
+            if fv.dtype not in (np.float32, np.float64):
+                fv = fv.astype(np.float64)
+            stats = np.array([fv.min(), fv.max(), fv.mean(), fv.std()]).tolist()
+            (info['minValue'], info['maxValue'],
+             info['meanValue'], info['stdValue']) = (f'{s:.6g}' for s in stats)
+    except Exception:
+        pass
+    try:
+        # .flat slicing copies just the 8 elements, whatever the layout —
+        # flatten() would copy the whole array first.
+        info['preview'] = str(v.flat[:8].tolist())
+    except Exception:
+        info['preview'] = f'ndarray{list(v.shape)}'
+    if tensor_dir is not None:
         try:
-            flat = v.flatten()[:8]
-            info['preview'] = str(flat.tolist())
+            safe_key = _UNSAFE_FILENAME_RE.sub('_', key)
+            npy_path = os.path.join(tensor_dir, f'{path_prefix}{safe_key}.npy')
+            np.save(npy_path, v)
+            info['npyPath'] = npy_path
         except Exception:
-            info['preview'] = f'Tensor{list(v.shape)}'
-        if tensor_dir is not None:
+            pass
+
+
+def _snap_dict(v, info, key, depth, tensor_dir, path_prefix, budget):
+    """dict: key count, total tensor bytes, children down to ``depth``."""
+    info['preview'] = f'dict({len(v)} keys)'
+    safe_key = _UNSAFE_FILENAME_RE.sub('_', key)
+    children, total_bytes = _snap_children(
+        ((str(dk), dv) for dk, dv in v.items()), len(v), depth - 1,
+        tensor_dir, f'{path_prefix}{safe_key}__', budget)
+    if total_bytes > 0:
+        info['sizeBytes'] = total_bytes
+    info['children'] = children
+
+
+def _snap_sequence(v, info, key, depth, tensor_dir, path_prefix, budget):
+    """list/tuple: length, aggregate stats for tensor lists, children."""
+    torch, np = _torch, _np
+    type_name = type(v).__name__
+    info['preview'] = f'{type_name}(len={len(v)})'
+    # Aggregate stats for homogeneous tensor/ndarray lists
+    if len(v) > 0:
+        first = v[0]
+        if isinstance(first, torch.Tensor):
+            info['shape'] = f'[{len(v)}x{list(first.shape)}]'
             try:
-                npy_path = os.path.join(tensor_dir, f'{path_prefix}{safe_key}.npy')
-                np.save(npy_path, v.detach().cpu().numpy())
-                info['npyPath'] = npy_path
+                # Running reductions, one tensor at a time — concatenating
+                # the whole list first could need gigabytes for big batches.
+                n, mean, m2, mn, mx = 0, 0.0, 0.0, math.inf, -math.inf
+                for t in v:
+                    if not isinstance(t, torch.Tensor) or t.numel() == 0:
+                        continue
+                    ft = t.detach()
+                    if ft.dtype not in (torch.float32, torch.float64):
+                        ft = ft.float()
+                    t_min, t_max = torch.aminmax(ft)
+                    t_var, t_mean = torch.var_mean(ft, unbiased=False)
+                    t_min, t_max, t_mean, t_var = torch.stack(
+                        [t_min, t_max, t_mean, t_var]).cpu().tolist()
+                    n, mean, m2 = _merge_moments(n, mean, m2,
+                                                 ft.numel(), t_mean, t_var * ft.numel())
+                    mn, mx = min(mn, t_min), max(mx, t_max)
+                if n > 0:
+                    # torch.std() is unbiased (n - 1); keep matching it.
+                    std = math.sqrt(m2 / (n - 1)) if n > 1 else math.nan
+                    info['minValue'] = f'{mn:.6g}'
+                    info['maxValue'] = f'{mx:.6g}'
+                    info['meanValue'] = f'{mean:.6g}'
+                    info['stdValue'] = f'{std:.6g}'
             except Exception:
                 pass
-
-    elif isinstance(v, np.ndarray):
-        info['shape'] = str(list(v.shape))
-        info['dtype'] = str(v.dtype)
-        info['sizeBytes'] = int(v.nbytes)
-        try:
-            if v.size > 0:
-                fv = v.astype(float)
-                info['minValue'] = f'{fv.min():.6g}'
-                info['maxValue'] = f'{fv.max():.6g}'
-                info['meanValue'] = f'{fv.mean():.6g}'
-                info['stdValue'] = f'{fv.std():.6g}'
-        except Exception:
-            pass
-        try:
-            info['preview'] = str(v.flatten()[:8].tolist())
-        except Exception:
-            info['preview'] = f'ndarray{list(v.shape)}'
-        if tensor_dir is not None:
+        elif isinstance(first, np.ndarray):
+            info['shape'] = f'[{len(v)}x{list(first.shape)}]'
             try:
-                npy_path = os.path.join(tensor_dir, f'{path_prefix}{safe_key}.npy')
-                np.save(npy_path, v)
-                info['npyPath'] = npy_path
+                n, mean, m2, mn, mx = 0, 0.0, 0.0, math.inf, -math.inf
+                for a in v:
+                    if not isinstance(a, np.ndarray) or a.size == 0:
+                        continue
+                    fa = a if a.dtype in (np.float32, np.float64) else a.astype(np.float64)
+                    n, mean, m2 = _merge_moments(n, mean, m2,
+                                                 fa.size, float(fa.mean()), float(fa.var()) * fa.size)
+                    mn, mx = min(mn, float(fa.min())), max(mx, float(fa.max()))
+                if n > 0:
+                    info['minValue'] = f'{mn:.6g}'
+                    info['maxValue'] = f'{mx:.6g}'
+                    info['meanValue'] = f'{mean:.6g}'
+                    info['stdValue'] = f'{math.sqrt(m2 / n):.6g}'
             except Exception:
                 pass
+    safe_key = _UNSAFE_FILENAME_RE.sub('_', key)
+    children, total_bytes = _snap_children(
+        ((f'[{i}]', item) for i, item in enumerate(v)), len(v), depth - 1,
+        tensor_dir, f'{path_prefix}{safe_key}__', budget)
+    if total_bytes > 0:
+        info['sizeBytes'] = total_bytes
+    info['children'] = children
+
+
+def _snap_children(items, total, depth, tensor_dir, path_prefix, budget):
+    """Walk a container once: sum tensor/array bytes and snapshot children.
+
+    ``items`` yields (key, value) pairs lazily; ``total`` is the container
+    length, used for the trailing "... N more" marker when not all fit.
+    Children are snapshotted until the count cap or byte budget runs out;
+    with ``depth < 0`` none are taken. Returns ``(children, total_bytes)``,
+    ``children`` being None when ``depth < 0``.
+    """
+    torch, np = _torch, _np
+    children = [] if depth >= 0 else None
+    total_bytes = 0
+    for child_key, child in items:
+        if isinstance(child, torch.Tensor):
+            total_bytes += child.element_size() * child.nelement()
+        elif isinstance(child, np.ndarray):
+            total_bytes += int(child.nbytes)
+        if (children is None or len(children) >= _MAX_CHILDREN
+                or budget[0] <= 0):
+            continue
+        child_info = _snapshot_value(child, child_key, depth,
+                                     tensor_dir=tensor_dir,
+                                     path_prefix=path_prefix,
+                                     budget=budget)
+        budget[0] -= _estimate_json_size(child_info)
+        children.append(child_info)
+    if children is not None and total > len(children):
+        children.append({
+            'key': f'... {total - len(children)} more', 'pythonType': '',
+            'shape': None, 'dtype': None, 'minValue': None, 'maxValue': None,
+            'meanValue': None, 'stdValue': None,
+            'preview': None, 'sizeBytes': None, 'children': None,
+            'npyPath': None,
+        })
+    return children, total_bytes
 
-    elif isinstance(v, dict):
-        info['preview'] = f'dict({len(v)} keys)'
-        total_bytes = 0
-        for dk, dv in v.items():
-            if isinstance(dv, torch.Tensor):
-                total_bytes += dv.element_size() * dv.nelement()
-            elif isinstance(dv, np.ndarray):
-                total_bytes += int(dv.nbytes)
-        if total_bytes > 0:
-            info['sizeBytes'] = total_bytes
-        if depth > 0 and len(v) <= 200:
-            info['children'] = [
-                _snapshot_value(dv, str(dk), depth - 1,
-                                tensor_dir=tensor_dir,
-                                path_prefix=f'{path_prefix}{safe_key}__')
-                for dk, dv in v.items()
-            ]
-
-    elif isinstance(v, (list, tuple)):
-        type_name = type(v).__name__
-        info['preview'] = f'{type_name}(len={len(v)})'
-        total_bytes = 0
-        for item in v:
-            if isinstance(item, torch.Tensor):
-                total_bytes += item.element_size() * item.nelement()
-            elif isinstance(item, np.ndarray):
-                total_bytes += int(item.nbytes)
-        if total_bytes > 0:
-            info['sizeBytes'] = total_bytes
-        # Aggregate stats for homogeneous tensor/ndarray lists
-        if len(v) > 0:
-            first = v[0]
-            if isinstance(first, torch.Tensor):
-                info['shape'] = f'[{len(v)}x{list(first.shape)}]'
-                try:
-                    tensors = [t for t in v if isinstance(t, torch.Tensor) and t.numel() > 0]
-                    all_vals = torch.cat([t.float().flatten() for t in tensors])
-                    info['minValue'] = f'{all_vals.min().item():.6g}'
-                    info['maxValue'] = f'{all_vals.max().item():.6g}'
-                    info['meanValue'] = f'{all_vals.mean().item():.6g}'
-                    info['stdValue'] = f'{all_vals.std().item():.6g}'
-                except Exception:
-                    pass
-            elif isinstance(first, np.ndarray):
-                info['shape'] = f'[{len(v)}x{list(first.shape)}]'
-                try:
-                    arrays = [a.astype(float).flatten() for a in v if isinstance(a, np.ndarray) and a.size > 0]
-                    all_vals = np.concatenate(arrays)
-                    info['minValue'] = f'{all_vals.min():.6g}'
-                    info['maxValue'] = f'{all_vals.max():.6g}'
-                    info['meanValue'] = f'{all_vals.mean():.6g}'
-                    info['stdValue'] = f'{all_vals.std():.6g}'
-                except Exception:
-                    pass
-        if depth > 0:
-            limit = min(len(v), 200)
-            children = [
-                _snapshot_value(v[i], f'[{i}]', depth - 1,
-                                tensor_dir=tensor_dir,
-                                path_prefix=f'{path_prefix}{safe_key}__')
-                for i in range(limit)
-            ]
-            if len(v) > limit:
-                children.append({
-                    'key': f'... {len(v) - limit} more', 'pythonType': '',
-                    'shape': None, 'dtype': None, 'minValue': None, 'maxValue': None,
-                    'meanValue': None, 'stdValue': None,
-                    'preview': None, 'sizeBytes': None, 'children': None,
-                    'npyPath': None,
-                })
-            info['children'] = children
-
-    elif isinstance(v, (str, int, float, bool)):
-        info['preview'] = repr(v)
-    else:
-        info['preview'] = repr(v)[:100]
 
-    return info
+def _estimate_json_size(info):
+    """Rough serialized size of one field dict, excluding its children."""
+    return (_FIELD_JSON_OVERHEAD + len(info['key']) + len(info['pythonType'])
+            + len(info['preview'] or '') + len(info['shape'] or '')
+            + len(info['npyPath'] or ''))
+
+
+def _merge_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """Combine (count, mean, sum of squared deviations) of two disjoint samples.
+
+    Chan et al.'s pairwise update — numerically stable, unlike accumulating
+    raw sums of squares.
+    """
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return n, mean, m2
+
+
+def _snap_scalar(v, info, key, depth, tensor_dir, path_prefix, budget):
+    info['preview'] = repr(v)
+
+
+def _snap_other(v, info, key, depth, tensor_dir, path_prefix, budget):
+    info['preview'] = repr(v)[:100]
+
+
+# Exact-type -> handler table. torch.Tensor / np.ndarray are added by
+# _lazy_imports(); other types (subclasses, custom classes) are resolved
+# once via isinstance and cached here.
+_SNAP_DISPATCH = {
+    dict: _snap_dict,
+    list: _snap_sequence,
+    tuple: _snap_sequence,
+    str: _snap_scalar,
+    int: _snap_scalar,
+    float: _snap_scalar,
+    bool: _snap_scalar,
+}
 
 
-def _snapshot_entry(entry, label, step_index, tensor_dir=None):
-    """Capture the state of an Entry's fields."""
+def _tensor_fingerprint(v):
+    """(in-place version, storage pointer, shape, dtype, content checksum) of
+    a tensor, else None.
+
+    torch bumps ``_version`` on in-place ops, but not on writes through
+    ``t.numpy()`` or ``t.data``, which alias the same storage, so the whole
+    buffer is hashed too: one read pass, still cheaper than the stats and
+    ``np.save`` it saves. Only contiguous CPU tensors are fingerprinted —
+    anything else, or anything that fails (e.g. meta tensors), returns None
+    and is never reused.
+    """
+    torch, _ = _lazy_imports()
+    if not isinstance(v, torch.Tensor):
+        return None
+    try:
+        version = getattr(v, '_version', None)
+        if version is None or v.device.type != 'cpu' or not v.is_contiguous():
+            return None
+        checksum = b''
+        if v.numel() > 0:
+            # Reinterpret as bytes without copying; works for every dtype,
+            # including ones numpy can't represent (bfloat16).
+            raw = v.detach().view(-1).view(torch.uint8).numpy()
+            checksum = hashlib.blake2b(raw, digest_size=16).digest()
+        return version, v.data_ptr(), tuple(v.shape), v.dtype, checksum
+    except Exception:
+        return None
+
+
+def _snapshot_fields(entry, keys, step_index, tensor_dir=None, field_cache=None):
+    """Yield the snapshot of each of an Entry's ``keys``, one field at a time.
+
+    ``field_cache`` (field name -> (tensor, fingerprint, info)) carries
+    snapshots across the steps of one dataset: a tensor field that's still
+    the same, unmodified object reuses the previous step's info instead of
+    recomputing stats and re-saving its .npy. Updated in place.
+    """
+    budget = [_CHILD_BUDGET_BYTES]
+    for key in keys:
+        v = entry[key]
+        fingerprint = _tensor_fingerprint(v) if field_cache is not None else None
+        cached = field_cache.get(key) if fingerprint is not None else None
+        if cached is not None and cached[0] is v and cached[1] == fingerprint:
+            info = cached[2]
+        else:
+            info = _snapshot_value(v, key,
+                                   tensor_dir=tensor_dir,
+                                   path_prefix=f's{step_index}_',
+                                   budget=budget)
+        if fingerprint is not None:
+            field_cache[key] = (v, fingerprint, info)
+        elif field_cache is not None:
+            field_cache.pop(key, None)
+        yield info
+
+
+def _emit_snapshot(entry, label, step_index, tensor_dir=None, field_cache=None):
+    """Stream the state of an Entry as snapshot_start / snapshot_field* / snapshot_end.
+
+    Each field goes out as soon as it's captured, so only one field's
+    snapshot is held at a time and no single event line grows with the
+    size of the whole Entry. The plugin reassembles the sequence.
+    """
     keys = sorted(entry.keys()) if hasattr(entry, 'keys') else []
-    fields = [
-        _snapshot_value(entry[key], key,
-                        tensor_dir=tensor_dir,
-                        path_prefix=f's{step_index}_')
-        for key in keys
-    ]
-    return {
+    _emit({
+        'type': 'snapshot_start',
         'stepLabel': label,
         'stepIndex': step_index,
-        'fields': fields,
+        'fieldCount': len(keys),
         'isBatched': getattr(entry, 'is_batched', False),
-    }
+    })
+    for info in _snapshot_fields(entry, keys, step_index,
+                                 tensor_dir=tensor_dir, field_cache=field_cache):
+        _emit({'type': 'snapshot_field', 'field': info})
+    _emit({'type': 'snapshot_end', 'stepIndex': step_index})
 
 
 # ── Probe logic ─────────────────────────────────────────────────────
@@ -257,7 +569,7 @@ def _probe_dataset(cfg, dataset_path, branch_choices,
     from srforge.config import ConfigResolver
 
     # Strip recache=True from all datasets to prevent shutil.rmtree during construction
-    _strip_recache(node)
+    _prepare_config(node)
 
     resolver = ConfigResolver(cfg)
 
@@ -265,24 +577,41 @@ def _probe_dataset(cfg, dataset_path, branch_choices,
                 tensor_dir=tensor_dir)
 
 
-def _strip_recache(node):
-    """Set recache=False on all dataset configs to prevent shutil.rmtree during
-    construction (recurses through single-child wrappers and composite lists)."""
-    from omegaconf import DictConfig, ListConfig, open_dict
+def _prepare_config(node):
+    """Prepare a dataset config for probing in a single traversal.
+
+    Sets recache=False on every dataset config reachable from ``node``
+    (single-child wrappers, composite lists and interpolated dataset nodes)
+    to prevent shutil.rmtree during construction.
+    """
+    from omegaconf import DictConfig, open_dict
     if not isinstance(node, DictConfig):
         return
+    # One open_dict for the whole walk — the flag is inherited by children.
     with open_dict(node):
-        if 'params' in node and node.params is not None:
-            if 'recache' in node.params:
-                node.params.recache = False
-            for k in node.params:
-                child = node.params[k]
-                if isinstance(child, DictConfig) and '_target' in child:
-                    _strip_recache(child)
-                elif isinstance(child, ListConfig):
-                    for item in child:
-                        if isinstance(item, DictConfig) and '_target' in item:
-                            _strip_recache(item)
+        _prepare_dataset_node(node)
+
+
+def _prepare_dataset_node(node):
+    from omegaconf import DictConfig, ListConfig, OmegaConf
+    params = node.get('params')
+    if not isinstance(params, DictConfig):
+        return
+    if 'recache' in params:
+        params.recache = False
+    # Read values unresolved so plain leaves (numbers, paths, ${ref:...}
+    # strings) are skipped without going through OmegaConf resolution;
+    # only interpolations can still turn out to be dataset nodes.
+    for k, child in params.items_ex(resolve=False):
+        if isinstance(child, str) and OmegaConf.is_interpolation(params, k):
+            child = params[k]
+        if isinstance(child, DictConfig):
+            if '_target' in child:
+                _prepare_dataset_node(child)
+        elif isinstance(child, ListConfig):
+            for item in child:
+                if isinstance(item, DictConfig) and '_target' in item:
+                    _prepare_dataset_node(item)
 
 
 def _disable_instance_cache(dataset):
@@ -312,6 +641,25 @@ def _disable_instance_cache(dataset):
                     _disable_instance_cache(item)
 
 
+def _instantiate_fresh(resolver, node):
+    """Build ``node`` with ``resolver``, bypassing instances it cached earlier.
+
+    ConfigResolver memoizes every object it builds by config path. Inner
+    datasets probed before this one had their live ``_transforms`` stripped,
+    so handing those cached instances to the wrapper would silently drop
+    the inner pipeline. Clearing the cache keeps the resolver (and the
+    config graph it walked on construction) while still constructing
+    everything anew; resolvers without a ``_instances`` dict (other
+    sr-forge versions) get replaced by a fresh one instead.
+    """
+    instances = getattr(resolver, '_instances', None)
+    if isinstance(instances, dict):
+        instances.clear()
+        return resolver(node)
+    from srforge.config import ConfigResolver
+    return ConfigResolver(resolver.config)(node)
+
+
 def _probe_node(resolver, node, path, branch_choices, dataset_paths, tensor_dir=None):
     """Recursively probe a dataset node and its transforms, emitting events.
 
@@ -397,9 +745,8 @@ def _probe_node(resolver, node, path, branch_choices, dataset_paths, tensor_dir=
     # Instantiate the dataset fully — ConfigResolver handles all reference
     # resolution ({ref:...}, %{...}, inline configs, etc.)
     # Note: recache was already stripped at config level to prevent shutil.rmtree.
-    from srforge.config import ConfigResolver as _CR
     try:
-        dataset = _CR(resolver.config)(node)
+        dataset = _instantiate_fresh(resolver, node)
     except Exception as e:
         _emit({
             'type': 'init_error',
@@ -421,8 +768,9 @@ def _probe_node(resolver, node, path, branch_choices, dataset_paths, tensor_dir=
 
     # Get raw entry (no transforms, no caching)
     entry = dataset[0]
-    snapshot = _snapshot_entry(entry, target_name, 0, tensor_dir=tensor_dir)
-    _emit({'type': 'snapshot', **snapshot})
+    field_cache = {}
+    _emit_snapshot(entry, target_name, 0, tensor_dir=tensor_dir,
+                   field_cache=field_cache)
 
     # Apply saved transforms one by one
     had_errors = False
@@ -430,8 +778,8 @@ def _probe_node(resolver, node, path, branch_choices, dataset_paths, tensor_dir=
         t_name = type(transform).__name__
         try:
             entry = transform(entry)
-            snapshot = _snapshot_entry(entry, t_name, i + 1, tensor_dir=tensor_dir)
-            _emit({'type': 'snapshot', **snapshot})
+            _emit_snapshot(entry, t_name, i + 1, tensor_dir=tensor_dir,
+                           field_cache=field_cache)
         except Exception as e:
             _emit({
                 'type': 'step_error',
@@ -13,6 +13,11 @@ import base64
 import io
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def main():
     with open(sys.argv[1], 'r', encoding='utf-8') as f:
@@ -28,19 +33,58 @@ def main():
             'errorTraceback': traceback.format_exc(),
         }
 
-    print(json.dumps(result, default=str), flush=True)
+    out = sys.stdout.buffer
+    out.write(_dumps(result))
+    out.write(b'\n')
+    out.flush()
+
+
+_cv2_module = None
+
+
+def _cv2():
+    """Import OpenCV on first use only; renders that never resize, colormap
+    or run CLAHE skip its sizeable import time entirely."""
+    global _cv2_module
+    if _cv2_module is None:
+        import cv2
+        _cv2_module = cv2
+    return _cv2_module
+
+
+def _dumps(result):
+    """Serialize the result to UTF-8 JSON, via orjson when it's installed.
+
+    The payload carries the base64 PNG and raw pixels, so it's routinely
+    megabytes — orjson encodes it several times faster than the stdlib.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(result, default=str).encode('utf-8')
 
 
 def render(config):
     npy_path = config['npyPath']
-    raw_arr = np.load(npy_path)
-    # Capture the *source* dtype kind before the float64 cast so we can
+    # Memory-map the file: index slices and reductions below then only page
+    # in the parts of the tensor they touch, and nothing is loaded up front.
+    raw_arr = np.load(npy_path, mmap_mode='r')
+    # Capture the *source* dtype kind before the float32 cast so we can
     # pick an interpolation that preserves discrete values (bool, int) on
     # downscale. numpy kind codes: 'b' = bool, 'i' = signed int,
     # 'u' = unsigned int, 'f' = float. Anything that isn't 'f' is treated
-    # as discrete and gets cv2.INTER_NEAREST in Step 6.
+    # as discrete and gets cv2.INTER_NEAREST in Step 4.
     is_discrete_dtype = raw_arr.dtype.kind in ('b', 'i', 'u')
-    data = raw_arr.astype(np.float64)
+    data = raw_arr
+    # mean/sum accumulate in float64 unless the source is already float32/64
+    # (ints could overflow, float16 would lose precision).
+    acc_dtype = None if raw_arr.dtype in (np.float32, np.float64) else np.float64
+    # Everything after the transpose works in the narrowest float that holds
+    # the source exactly: float32 for bool, (u)int8/16 and float16, float64
+    # for wider ints (above 2**24) and float64 (beyond float32's range).
+    work_dtype = np.result_type(raw_arr.dtype, np.float32)
 
     dim_roles = config.get('dimRoles', [])
     channel_mode = config.get('channelMode', 'rgb')
@@ -71,37 +115,45 @@ def render(config):
         else:
             reduce_actions.append(r)
 
-    # Apply reductions from highest dim index to lowest to avoid index shifting
-    reduce_actions.sort(key=lambda a: a['dimIndex'], reverse=True)
-    for action in reduce_actions:
-        dim_idx = action['dimIndex']
-        role = action['role']
-        if dim_idx >= data.ndim:
+    # Apply reductions. Each action names an axis of the *original* array;
+    # live_axes maps those to the current axis positions as dims disappear.
+    # Consecutive reductions with the same role run as one multi-axis ufunc
+    # call, skipping the intermediate array between them.
+    live_axes = list(range(data.ndim))
+    for role, actions in _reduction_runs(_order_reductions(reduce_actions, data.strides)):
+        dims = [a['dimIndex'] for a in actions if a['dimIndex'] in live_axes]
+        dims = list(dict.fromkeys(dims))  # a repeated dimIndex reduces once
+        if not dims:
             continue
+        axes = tuple(live_axes.index(d) for d in dims)
         if role == 'index':
-            idx = min(int(action.get('value', 0)), data.shape[dim_idx] - 1)
-            data = np.take(data, idx, axis=dim_idx)
+            cur = axes[0]
+            idx = min(int(actions[0].get('value', 0)), data.shape[cur] - 1)
+            # Basic indexing returns a view (np.take would copy), so chained
+            # index slices of the memmap never materialize anything.
+            sl = [slice(None)] * data.ndim
+            sl[cur] = idx
+            data = data[tuple(sl)]
         elif role == 'mean':
-            data = np.mean(data, axis=dim_idx)
+            data = np.mean(data, axis=axes, dtype=acc_dtype)
         elif role == 'max':
-            data = np.max(data, axis=dim_idx)
+            data = np.max(data, axis=axes)
         elif role == 'min':
-            data = np.min(data, axis=dim_idx)
+            data = np.min(data, axis=axes)
         elif role == 'sum':
-            data = np.sum(data, axis=dim_idx)
+            data = np.sum(data, axis=axes, dtype=acc_dtype)
+        else:
+            continue
+        for d in dims:
+            live_axes.remove(d)
 
     # Remap H/W/C axis indices after reductions removed some dims
-    reduced_indices = sorted([a['dimIndex'] for a in reduce_actions])
-
-    def remap_axis(orig_idx):
-        return orig_idx - sum(1 for r in reduced_indices if r < orig_idx)
-
     if h_axis is not None:
-        h_axis = remap_axis(h_axis)
+        h_axis = live_axes.index(h_axis)
     if w_axis is not None:
-        w_axis = remap_axis(w_axis)
+        w_axis = live_axes.index(w_axis)
     if c_axis is not None:
-        c_axis = remap_axis(c_axis)
+        c_axis = live_axes.index(c_axis)
 
     # Handle edge cases: missing H or W (e.g., 1D tensor or all-reduced)
     if h_axis is None:
@@ -115,14 +167,20 @@ def render(config):
         data = np.expand_dims(data, data.ndim)
         w_axis = data.ndim - 1
 
-    # Transpose to (H, W, C) or (H, W)
+    # Transpose to (H, W, C) or (H, W). Materialize the result C-contiguous
+    # once so the channel selection, stats, histogram and display transforms
+    # below all get contiguous fast paths instead of strided access. The
+    # same copy converts to the working dtype — only the reduced data is ever
+    # converted, and a file already in that dtype and order is not copied.
+    # float32 halves the bytes every later step moves compared to float64;
+    # stats are boxed to Python floats at the end anyway.
     if c_axis is not None:
         perm = (h_axis, w_axis, c_axis)
-        data = np.transpose(data, perm)
+        data = np.ascontiguousarray(np.transpose(data, perm), dtype=work_dtype)
         channels = data  # [H, W, C]
     else:
         perm = (h_axis, w_axis)
-        data = np.transpose(data, perm)
+        data = np.ascontiguousarray(np.transpose(data, perm), dtype=work_dtype)
         channels = data[:, :, np.newaxis]  # [H, W, 1]
 
     shape_after = list(channels.shape)
@@ -130,17 +188,20 @@ def render(config):
 
     # Step 3: Channel selection
     if channel_mode == 'custom_rgb':
-        img = np.zeros((h, w, 3), dtype=np.float64)
-        for i, ch_idx in enumerate(custom_rgb_channels[:3]):
-            ch_idx = min(int(ch_idx), c - 1)
-            img[:, :, i] = channels[:, :, ch_idx]
+        # One fancy-index gather instead of a copy per channel
+        idx = np.minimum(np.asarray(custom_rgb_channels[:3], dtype=np.intp), c - 1)
+        if len(idx) == 3:
+            img = np.ascontiguousarray(channels[:, :, idx])
+        else:
+            img = np.zeros((h, w, 3), dtype=work_dtype)
+            img[:, :, :len(idx)] = channels[:, :, idx]
     elif channel_mode == 'rgb':
         if c >= 3:
             img = channels[:, :, :3]
         elif c == 1:
             img = np.repeat(channels, 3, axis=2)
         else:
-            img = np.zeros((h, w, 3), dtype=np.float64)
+            img = np.zeros((h, w, 3), dtype=work_dtype)
             img[:, :, :c] = channels[:, :, :c]
     elif channel_mode == 'single_channel':
         reduce_mode = channel_action.get('mode', 'index')
@@ -164,94 +225,96 @@ def render(config):
     is_single_channel = (img.shape[2] == 1)
 
     # Compute stats on the selected image data before display transform
-    stats = {
-        'min': float(np.min(img)),
-        'max': float(np.max(img)),
-        'mean': float(np.mean(img)),
-        'std': float(np.std(img)),
-        'shape': shape_after,
-    }
+    stats = _image_stats(img)
+    stats['shape'] = shape_after
 
     # Encode raw float pixel data for hover inspection (H, W, C) as float32
-    raw_f32 = img.astype(np.float32)
-    raw_pixels_b64 = base64.b64encode(raw_f32.tobytes()).decode('ascii')
+    # Opt-in: at full resolution this is the largest part of the payload.
+    raw_pixels_b64 = None
+    if config.get('includeRawPixels', False):
+        if img.dtype == np.float32 and img.flags.c_contiguous:
+            raw_bytes = memoryview(img).cast('B')  # zero-copy
+        else:
+            raw_bytes = np.ascontiguousarray(img, dtype=np.float32).tobytes()
+        raw_pixels_b64 = base64.b64encode(raw_bytes).decode('ascii')
     raw_pixel_shape = list(img.shape)  # [H, W, C]
 
     # Compute histogram
     num_bins = max(4, min(int(config.get('numBins', 256)), 4096))
-    hist_data = img.flatten()
-    if len(hist_data) > 0:
-        hist_counts, hist_edges = np.histogram(hist_data, bins=num_bins)
+    if img.size > 0:
+        hist_counts, hist_edges = _histogram(img, num_bins,
+                                             stats['min'], stats['max'])
     else:
         hist_counts = np.zeros(num_bins, dtype=int)
         hist_edges = np.linspace(0, 1, num_bins + 1)
-    histogram = [
-        {'binStart': float(hist_edges[i]),
-         'binEnd': float(hist_edges[i + 1]),
-         'count': int(hist_counts[i])}
-        for i in range(num_bins)
-    ]
-
-    # Step 4: Apply display transform
+    # Parallel arrays: .tolist() converts in C instead of boxing a dict per bin
+    histogram = {
+        'binStarts': hist_edges[:-1].tolist(),
+        'binEnds': hist_edges[1:].tolist(),
+        'counts': hist_counts.tolist(),
+    }
+
+    # Step 4: Resize for performance. Done before the display transforms so
+    # equalization, CLAHE and the colormap only process the pixels that are
+    # actually shown; stats, histogram and raw pixels stay full resolution.
+    view = img
+    if w > output_width:
+        scale = output_width / w
+        new_h = max(1, int(h * scale))
+        cv2 = _cv2()
+        # INTER_AREA averages source pixels — fine for natural float images
+        # but it would turn a 0/1 bool mask into fractional values. Force
+        # INTER_NEAREST for discrete dtypes so the downscale preserves
+        # exact pixel values.
+        resize_interp = cv2.INTER_NEAREST if is_discrete_dtype else cv2.INTER_AREA
+        view = cv2.resize(np.ascontiguousarray(img), (output_width, new_h),
+                          interpolation=resize_interp)
+        if view.ndim == 2:  # cv2 drops a single channel axis
+            view = view[:, :, np.newaxis]
+
+    # Step 5: Apply display transform
+    # Reuse the extremes from the stats instead of sweeping the image again.
+    # For a single channel they are also that channel's range.
+    vmin, vmax = stats['min'], stats['max']
+    channel_ranges = [(vmin, vmax)] if is_single_channel else None
     if display_mode == 'normalized':
-        vmin, vmax = np.min(img), np.max(img)
         if vmax - vmin > 1e-8:
-            display = (img - vmin) / (vmax - vmin) * 255.0
+            display = _scale_to_display(view, vmin, vmax - vmin)
         else:
-            display = np.full_like(img, 128.0)
+            display = np.full(view.shape, 128.0, dtype=np.float32)
     elif display_mode == 'custom_range':
         rng = max(custom_max - custom_min, 1e-8)
-        display = np.clip((img - custom_min) / rng * 255.0, 0, 255)
+        # Out-of-range values are clipped below together with every mode
+        display = _scale_to_display(view, custom_min, rng)
     elif display_mode == 'histogram_eq':
-        display = _histogram_equalize(img)
+        display = _histogram_equalize(view, channel_ranges)
     elif display_mode == 'clahe':
-        display = _apply_clahe(img, clahe_clip, clahe_tile)
+        display = _apply_clahe(view, clahe_clip, clahe_tile, channel_ranges)
     else:
         # Fallback: min-max
-        vmin, vmax = np.min(img), np.max(img)
         if vmax - vmin > 1e-8:
-            display = (img - vmin) / (vmax - vmin) * 255.0
+            display = _scale_to_display(view, vmin, vmax - vmin)
         else:
-            display = np.full_like(img, 128.0)
+            display = np.full(view.shape, 128.0, dtype=np.float32)
 
-    display = np.round(np.clip(display, 0, 255)).astype(np.uint8)
+    # Every branch above returns a fresh float buffer, so clamp and shift it
+    # in place; the uint8 cast then truncates, i.e. rounds half up.
+    np.clip(display, 0, 255, out=display)
+    display += 0.5
+    display = display.astype(np.uint8)
 
-    # Step 5: Apply colormap for single-channel images
+    # Step 6: Apply colormap for single-channel images
     pixel_format = 'grayscale' if is_single_channel else 'rgb'
     if is_single_channel and colormap_name != 'gray':
-        import cv2
-        cmap_map = {
-            'viridis': cv2.COLORMAP_VIRIDIS,
-            'jet': cv2.COLORMAP_JET,
-            'inferno': cv2.COLORMAP_INFERNO,
-            'turbo': cv2.COLORMAP_TURBO,
-        }
-        cmap = cmap_map.get(colormap_name, cv2.COLORMAP_VIRIDIS)
-        display = cv2.applyColorMap(display[:, :, 0], cmap)
-        display = cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
+        # One gather through a 256-entry RGB table: (H, W) -> (H, W, 3)
+        display = _colormap_lut(colormap_name)[display[:, :, 0]]
         pixel_format = 'rgb'
     elif is_single_channel:
-        display = np.repeat(display, 3, axis=2)
-
-    # Step 6: Resize for performance
-    if w > output_width:
-        scale = output_width / w
-        new_h = max(1, int(h * scale))
-        import cv2
-        # INTER_AREA averages source pixels — fine for natural float images
-        # but it would turn a 0/255 bool mask into mid-grays. Force
-        # INTER_NEAREST for discrete dtypes so the downscale preserves
-        # exact pixel values.
-        resize_interp = cv2.INTER_NEAREST if is_discrete_dtype else cv2.INTER_AREA
-        display = cv2.resize(display, (output_width, new_h),
-                             interpolation=resize_interp)
+        # Encoded as a grayscale PNG, no need to triplicate the channel
+        display = display[:, :, 0]
 
     # Step 7: Encode to PNG base64
-    from PIL import Image
-    pil_img = Image.fromarray(display)
-    buf = io.BytesIO()
-    pil_img.save(buf, format='PNG')
-    image_b64 = base64.b64encode(buf.getvalue()).decode('ascii')
+    image_b64 = base64.b64encode(_encode_png(display)).decode('ascii')
 
     return {
         'image': image_b64,
@@ -265,37 +328,245 @@ def render(config):
     }
 
 
-def _histogram_equalize(img):
-    """Per-channel histogram equalization."""
-    import cv2
-    result = np.zeros_like(img)
-    for c_idx in range(img.shape[2]):
-        ch = img[:, :, c_idx]
-        vmin, vmax = np.min(ch), np.max(ch)
-        if vmax - vmin > 1e-8:
-            normalized = ((ch - vmin) / (vmax - vmin) * 255).astype(np.uint8)
+# OpenCV colormap constant per colormap name; unknown names use viridis
+_COLORMAPS = {
+    'viridis': 'COLORMAP_VIRIDIS',
+    'jet': 'COLORMAP_JET',
+    'inferno': 'COLORMAP_INFERNO',
+    'turbo': 'COLORMAP_TURBO',
+}
+_COLORMAP_LUTS = {}
+
+
+def _colormap_lut(name):
+    """(256, 3) uint8 RGB lookup table for an OpenCV colormap.
+
+    Built by running the colormap over a 0..255 ramp once, so coloring an
+    image is a single table gather rather than applyColorMap + a BGR->RGB
+    conversion over the whole image.
+    """
+    lut = _COLORMAP_LUTS.get(name)
+    if lut is None:
+        cv2 = _cv2()
+        cmap = getattr(cv2, _COLORMAPS.get(name, 'COLORMAP_VIRIDIS'))
+        ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+        bgr = cv2.applyColorMap(ramp, cmap).reshape(256, 3)
+        lut = _COLORMAP_LUTS[name] = np.ascontiguousarray(bgr[:, ::-1])
+    return lut
+
+
+# zlib level for the preview PNG: ~3x faster to encode than the usual
+# default of 6 for a few percent more bytes.
+_PNG_COMPRESSION = 3
+
+
+def _encode_png(display):
+    """Encode an (H, W) grayscale or (H, W, 3) RGB uint8 image as PNG bytes.
+
+    Uses OpenCV's libpng encoder when an earlier step already loaded cv2.
+    Otherwise PIL is used: importing OpenCV costs far more than encoding a
+    preview-sized image, so it isn't worth loading just for this.
+    """
+    if _cv2_module is None:
+        try:
+            from PIL import Image
+        except ImportError:
+            pass
         else:
-            normalized = np.full_like(ch, 128, dtype=np.uint8)
-        result[:, :, c_idx] = cv2.equalizeHist(normalized).astype(np.float64)
-    return result
+            buf = io.BytesIO()
+            Image.fromarray(display).save(buf, format='PNG',
+                                          compress_level=_PNG_COMPRESSION)
+            return buf.getvalue()
+    cv2 = _cv2()
+    if display.ndim == 3:
+        display = cv2.cvtColor(display, cv2.COLOR_RGB2BGR)
+    ok, buf = cv2.imencode('.png', display,
+                           [cv2.IMWRITE_PNG_COMPRESSION, _PNG_COMPRESSION])
+    if not ok:
+        raise RuntimeError('PNG encoding failed')
+    return buf.tobytes()
+
+
+def _scale_to_display(img, lo, span):
+    """Map [lo, lo + span] to [0, 255] into one new buffer of img's dtype.
+
+    Subtract-then-scale in place instead of (img - lo) / span * 255, which
+    allocates a temporary per operator. A single img * scale + offset would
+    save one more sweep but cancels catastrophically when |lo| >> span.
+    """
+    out = np.empty(img.shape, dtype=img.dtype)
+    np.subtract(img, lo, out=out)
+    out *= out.dtype.type(255.0 / span)
+    return out
+
+
+def _image_stats(img):
+    """min/max/mean/std of an image with the mean computed only once.
+
+    np.std() recomputes the mean internally; reusing ours and squaring the
+    deviations in place saves a full sweep and a temporary per call. Numba
+    would fuse everything into one pass, but the script runs as a fresh
+    process every time, so JIT compilation would cost more than it saves.
+
+    Mean and deviations are accumulated in float64, and the deviations are
+    divided by their largest magnitude before squaring, so the std neither
+    overflows for huge values nor underflows to zero for tiny ones.
+    """
+    vmin = float(np.min(img))
+    vmax = float(np.max(img))
+    mean = np.mean(img, dtype=np.float64)
+    dev = np.subtract(img, mean, dtype=np.float64)
+    scale = max(vmax - mean, mean - vmin)
+    if 0 < scale < np.inf:
+        dev /= scale
+    else:
+        scale = 1.0
+    np.multiply(dev, dev, out=dev)
+    return {
+        'min': vmin,
+        'max': vmax,
+        'mean': float(mean),
+        'std': float(scale * np.sqrt(np.mean(dev))),
+    }
 
 
-def _apply_clahe(img, clip_limit, tile_size):
-    """Per-channel CLAHE."""
-    import cv2
-    clahe = cv2.createCLAHE(clipLimit=clip_limit,
-                             tileGridSize=(tile_size, tile_size))
-    result = np.zeros_like(img)
+def _histogram(img, num_bins, vmin, vmax):
+    """Equal-width histogram over [vmin, vmax], like np.histogram(bins=N).
+
+    The bin index is computed directly and counted with np.bincount, which
+    skips np.histogram's float64 upcast and edge-correction passes. Values
+    within float32 rounding of a bin edge may land in the neighbouring bin.
+    """
+    if not (np.isfinite(vmin) and np.isfinite(vmax)):
+        # Let np.histogram raise its usual error for NaN/inf data
+        return np.histogram(img.ravel(), bins=num_bins)
+    if vmax <= vmin:
+        # Constant image: same layout np.histogram uses
+        counts = np.zeros(num_bins, dtype=np.int64)
+        counts[num_bins // 2] = img.size
+        return counts, np.linspace(vmin - 0.5, vmax + 0.5, num_bins + 1)
+    pos = np.subtract(img, vmin)
+    with np.errstate(over='ignore'):
+        scale = pos.dtype.type(num_bins / (vmax - vmin))
+    if not (0 < scale < np.inf):
+        # Range too narrow (or too wide) for the scale to fit img's dtype;
+        # np.histogram would hit the same limit on float32, so go float64.
+        return np.histogram(img.ravel().astype(np.float64), bins=num_bins)
+    pos *= scale
+    np.minimum(pos, num_bins - 1, out=pos)  # vmax belongs to the last bin
+    # num_bins <= 4096, so the truncated indices fit in uint16
+    counts = np.bincount(pos.astype(np.uint16).ravel(), minlength=num_bins)
+    return counts, np.linspace(vmin, vmax, num_bins + 1)
+
+
+# Groups of reductions whose results don't depend on the order they run in.
+_COMMUTING_ROLES = ({'mean', 'sum'}, {'max'}, {'min'})
+
+
+def _order_reductions(actions, strides):
+    """Order reduce/slice actions for contiguous memory access.
+
+    Index slices go first: they commute with every reduction and shrink the
+    data the others have to read. The remaining reductions run largest
+    stride first, so each one collapses the least contiguous axis left,
+    but only when they commute (mean and sum are both linear; max-of-mean
+    is not mean-of-max). Mixed groups keep the highest-dim-first order.
+    """
+    def valid(a):
+        return a['dimIndex'] < len(strides)
+
+    indexes = [a for a in actions if a['role'] == 'index']
+    reductions = [a for a in actions if a['role'] != 'index']
+    roles = {a['role'] for a in reductions}
+    if any(roles <= group for group in _COMMUTING_ROLES):
+        reductions.sort(key=lambda a: -strides[a['dimIndex']] if valid(a) else 0)
+    else:
+        reductions.sort(key=lambda a: a['dimIndex'], reverse=True)
+    return indexes + reductions
+
+
+def _reduction_runs(actions):
+    """Group ordered actions into (role, [actions]) runs.
+
+    Consecutive reductions sharing a role form one run, since e.g. a mean
+    of means over two axes is the mean over both. Index slices always form
+    runs of one.
+    """
+    runs = []
+    for action in actions:
+        role = action['role']
+        if runs and role != 'index' and runs[-1][0] == role:
+            runs[-1][1].append(action)
+        else:
+            runs.append((role, [action]))
+    return runs
+
+
+def _histogram_equalize(img, channel_ranges=None):
+    """Per-channel histogram equalization.
+
+    Quantizes each channel to 256 levels, then maps it through a cumulative
+    histogram lookup table built with np.bincount (same mapping as
+    cv2.equalizeHist). ``channel_ranges`` optionally gives each channel's
+    (min, max) when the caller already knows it.
+    """
+    result = np.empty_like(img)
     for c_idx in range(img.shape[2]):
         ch = img[:, :, c_idx]
-        vmin, vmax = np.min(ch), np.max(ch)
-        if vmax - vmin > 1e-8:
-            normalized = ((ch - vmin) / (vmax - vmin) * 255).astype(np.uint8)
+        if channel_ranges is not None:
+            vmin, vmax = channel_ranges[c_idx]
         else:
-            normalized = np.full_like(ch, 128, dtype=np.uint8)
-        result[:, :, c_idx] = clahe.apply(normalized).astype(np.float64)
+            vmin, vmax = np.min(ch), np.max(ch)
+        if not vmax - vmin > 1e-8:
+            result[:, :, c_idx] = 128.0
+            continue
+        q = ((ch - vmin) / (vmax - vmin) * 255).astype(np.uint8)
+        result[:, :, c_idx] = _equalize_lut(q)[q]
     return result
 
 
+def _equalize_lut(q):
+    """256-entry equalization LUT for a uint8 image, as cv2.equalizeHist builds it."""
+    hist = np.bincount(q.ravel(), minlength=256)
+    first = int(np.flatnonzero(hist)[0])
+    if hist[first] == q.size:
+        # Single level: cv2 maps everything to that level
+        return np.full(256, first, dtype=np.uint8)
+    # The first occupied level maps to 0, the last to 255. Scale in float32
+    # like OpenCV does so ties round the same way.
+    cdf = (np.cumsum(hist) - hist[first]).astype(np.float32)
+    lut = np.rint(cdf * np.float32(255.0 / (q.size - hist[first])))
+    return np.clip(lut, 0, 255).astype(np.uint8)
+
+
+def _apply_clahe(img, clip_limit, tile_size, channel_ranges=None):
+    """Per-channel CLAHE; ``channel_ranges`` as in _histogram_equalize.
+
+    Range normalization and the uint8 quantization run over all channels at
+    once; only clahe.apply itself is called per channel.
+    """
+    cv2 = _cv2()
+    if channel_ranges is not None:
+        vmin = np.array([r[0] for r in channel_ranges], dtype=img.dtype)
+        vmax = np.array([r[1] for r in channel_ranges], dtype=img.dtype)
+    else:
+        vmin, vmax = img.min(axis=(0, 1)), img.max(axis=(0, 1))
+    span = vmax - vmin
+    flat = ~(span > 1e-8)
+    span[flat] = 1
+    q = np.subtract(img, vmin)
+    q /= span
+    q *= 255
+    q = q.astype(np.uint8)
+    q[:, :, flat] = 128
+
+    clahe = cv2.createCLAHE(clipLimit=clip_limit,
+                            tileGridSize=(tile_size, tile_size))
+    out = np.empty_like(q)
+    for c_idx in range(q.shape[2]):
+        out[:, :, c_idx] = clahe.apply(np.ascontiguousarray(q[:, :, c_idx]))
+    return out.astype(img.dtype)
+
+
 if __name__ == '__main__':
     main()